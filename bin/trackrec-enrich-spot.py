@@ -12,21 +12,28 @@ Design goals:
 
 import argparse
 import base64
+import http.client
 import json
 import os
+import queue
 import re
 import sys
+import threading
 import time
-from urllib.error import HTTPError, URLError
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, urlsplit
+from urllib.request import Request
 
 from mutagen import File as MFile
 
 # Spotify track IDs are always 22-character base62-ish strings.
 SPOTIFY_ID_RE = re.compile(r"^[A-Za-z0-9]{22}$")
 
+# Canonical track URL prefix, as written by the recorder.
+SPOTIFY_TRACK_URL_PREFIX = "https://open.spotify.com/track/"
+
 # Default HTTP behavior for Spotify API calls.
 # These values can be overridden from the CLI in main().
 HTTP_MAX_RETRIES = 6
@@ -45,84 +52,187 @@ def eprint(*a, **kw):
     print(*a, file=sys.stderr, **kw)
 
 
+# ---------------------------------------------------------------------------
+# Parallel batch output
+# ---------------------------------------------------------------------------
+#
+# With --jobs > 1 several files are enriched at the same time. Each worker
+# buffers its own stdout/stderr and emits it in one piece once its file is
+# done, so the per-file output blocks do not interleave.
+# ---------------------------------------------------------------------------
+
+OUTPUT_LOCK = threading.Lock()
+
+
+class ThreadBufferedStream:
+    """Stream proxy that buffers writes per thread between begin() and end()."""
+
+    def __init__(self, stream: Any):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, s: str) -> int:
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            return self._stream.write(s)
+        buf.append(s)
+        return len(s)
+
+    def flush(self) -> None:
+        if getattr(self._local, "buf", None) is None:
+            self._stream.flush()
+
+    def begin(self) -> None:
+        self._local.buf = []
+
+    def end(self) -> None:
+        buf = getattr(self._local, "buf", None)
+        self._local.buf = None
+        if buf:
+            self._stream.write("".join(buf))
+            self._stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+def run_buffered(fn, *a, **kw):
+    """Run fn with this thread's stdout/stderr buffered, then emit them together."""
+    out, err = sys.stdout, sys.stderr
+    out.begin()
+    err.begin()
+    try:
+        return fn(*a, **kw)
+    finally:
+        with OUTPUT_LOCK:
+            out.end()
+            err.end()
+
+
 # ---------------------------------------------------------------------------
 # HTTP / Spotify API helpers
 # ---------------------------------------------------------------------------
 #
 # All Spotify API requests go through http_json(). This centralizes:
+# - keep-alive connection reuse (one HTTPS connection per host and thread)
 # - rate-limit handling (429 + Retry-After)
 # - transient network retries
 # - auth error signaling (401 -> refreshable, 403 -> not refreshable here)
 #
+# Reusing the connection saves a TCP + TLS handshake on every API call after
+# the first one, which is most of the per-call latency in a batch run.
+#
 # The small default_sleep is intentional. Even a tiny pacing delay can reduce
-# the chance of hitting Spotify's rate limit during larger batch runs.
+# the chance of hitting Spotify's rate limit during larger batch runs. It is a
+# global minimum gap between request starts, shared by all worker threads, so
+# --jobs does not multiply the request rate. A 429 pushes the shared next slot
+# out by the Retry-After delay, so all workers pause, not just the one that
+# was throttled.
 # ---------------------------------------------------------------------------
 
+_HTTP_LOCAL = threading.local()
+
+_HTTP_PACE_LOCK = threading.Lock()
+_HTTP_NEXT_AT = 0.0
+
+
+def _http_pace(interval: float) -> None:
+    """Space request starts at least `interval` seconds apart across threads."""
+    global _HTTP_NEXT_AT
+    while True:
+        with _HTTP_PACE_LOCK:
+            now = time.monotonic()
+            wait = _HTTP_NEXT_AT - now
+            if wait <= 0:
+                _HTTP_NEXT_AT = now + max(0.0, interval)
+                return
+        # Check again after sleeping: another thread may have taken the slot
+        # or a 429 may have pushed it further out.
+        time.sleep(wait)
+
+
+def _http_hold(wait: float) -> None:
+    """Hold back all threads' next requests for at least `wait` seconds."""
+    global _HTTP_NEXT_AT
+    with _HTTP_PACE_LOCK:
+        _HTTP_NEXT_AT = max(_HTTP_NEXT_AT, time.monotonic() + wait)
+
+
+def _http_conns() -> Dict[str, http.client.HTTPSConnection]:
+    """Return this thread's keep-alive connections, keyed by host."""
+    conns = getattr(_HTTP_LOCAL, "conns", None)
+    if conns is None:
+        conns = _HTTP_LOCAL.conns = {}
+    return conns
+
+
+def _http_drop(host: str) -> None:
+    """Close and forget this thread's connection to host."""
+    conn = _http_conns().pop(host, None)
+    if conn is not None:
+        conn.close()
+
+
 def http_json(
     req: Request,
     *,
+    token: Optional["SpotifyToken"] = None,
     max_retries: int = HTTP_MAX_RETRIES,
     base_backoff: float = HTTP_BASE_BACKOFF,
     max_backoff: float = HTTP_MAX_BACKOFF,
-    default_sleep: float = HTTP_DEFAULT_SLEEP,
+    default_sleep: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
     Execute an HTTP request and return JSON.
 
     Behavior:
-    - On 429: honor Retry-After if available, otherwise use exponential backoff.
+    - Pace request starts globally by default_sleep (default: --sleep).
+    - Reuse a keep-alive connection to the host; a dropped idle connection is
+      reopened once without counting as a retry.
+    - On 429: honor Retry-After if available, otherwise use exponential backoff;
+      the wait applies to all threads.
     - On transient network errors: retry with backoff.
-    - On 401: raise SpotifyAuthError so caller can refresh token.
+    - If `token` is given, send it as the bearer token. On a 401, refresh it
+      and retry once (all Spotify API calls are idempotent GETs).
+    - On 401 without a token, or a second 401: raise SpotifyAuthError.
     - On 403: raise normal RuntimeError (refreshing usually does not help).
     """
     attempt = 0
     backoff = base_backoff
+    if default_sleep is None:
+        default_sleep = HTTP_DEFAULT_SLEEP
+
+    url = urlsplit(req.full_url)
+    host = url.netloc
+    target = url.path + (f"?{url.query}" if url.query else "")
+    headers = dict(req.header_items())
+    bearer = ""
+    auth_retried = False
 
     while True:
-        try:
-            with urlopen(req, timeout=30) as r:
-                if default_sleep > 0:
-                    time.sleep(default_sleep)
-                data = r.read()
-            return json.loads(data.decode("utf-8", "replace"))
+        if token is not None:
+            bearer = token.value()
+            headers["Authorization"] = f"Bearer {bearer}"
 
-        except HTTPError as e:
-            body = ""
-            try:
-                body = e.read().decode("utf-8", "replace")
-            except Exception:
-                body = ""
-
-            if e.code == 429:
-                ra = e.headers.get("Retry-After")
-                if ra:
-                    try:
-                        wait = float(ra)
-                    except Exception:
-                        wait = backoff
-                else:
-                    wait = backoff
+        conns = _http_conns()
+        reused = host in conns
+        if not reused:
+            conns[host] = http.client.HTTPSConnection(host, timeout=30)
 
-                attempt += 1
-                if attempt > max_retries:
-                    raise RuntimeError(f"HTTP 429 Too Many Requests (retries exceeded). body={body[:200]}")
+        _http_pace(default_sleep)
 
-                wait = min(max_backoff, max(0.5, wait))
-                eprint(f"[rate-limit] 429 Too Many Requests. sleeping {wait:.1f}s (attempt {attempt}/{max_retries})")
-                time.sleep(wait)
-                backoff = min(max_backoff, backoff * 2)
+        try:
+            conn = conns[host]
+            conn.request(req.get_method(), target, body=req.data, headers=headers)
+            r = conn.getresponse()
+            data = r.read()
+
+        except (http.client.HTTPException, OSError) as e:
+            _http_drop(host)
+            if reused:
+                # The server may close idle keep-alive connections at any time.
                 continue
 
-            if e.code == 401:
-                raise SpotifyAuthError(f"HTTP 401 auth error. body={body[:200]}")
-
-            # 403 is usually a permission / policy issue, not a stale-token issue.
-            if e.code == 403:
-                raise RuntimeError(f"HTTP 403 forbidden. body={body[:200]}")
-
-            raise RuntimeError(f"HTTP {e.code} error. body={body[:200]}")
-
-        except (URLError, TimeoutError) as e:
             attempt += 1
             if attempt > max_retries:
                 raise RuntimeError(f"Network error (retries exceeded): {e}")
@@ -132,6 +242,49 @@ def http_json(
             backoff = min(max_backoff, backoff * 2)
             continue
 
+        if r.will_close:
+            _http_drop(host)
+
+        if r.status < 400:
+            return json.loads(data.decode("utf-8", "replace"))
+
+        body = data.decode("utf-8", "replace")
+
+        if r.status == 429:
+            ra = r.getheader("Retry-After")
+            if ra:
+                try:
+                    wait = float(ra)
+                except Exception:
+                    wait = backoff
+            else:
+                wait = backoff
+
+            attempt += 1
+            if attempt > max_retries:
+                raise RuntimeError(f"HTTP 429 Too Many Requests (retries exceeded). body={body[:200]}")
+
+            wait = min(max_backoff, max(0.5, wait))
+            eprint(f"[rate-limit] 429 Too Many Requests. sleeping {wait:.1f}s (attempt {attempt}/{max_retries})")
+            # _http_pace() at the top of the loop does the sleeping.
+            _http_hold(wait)
+            backoff = min(max_backoff, backoff * 2)
+            continue
+
+        if r.status == 401:
+            if token is not None and not auth_retried:
+                eprint("[auth] HTTP 401, refreshing token and retrying once ...")
+                token.invalidate(bearer)
+                auth_retried = True
+                continue
+            raise SpotifyAuthError(f"HTTP 401 auth error. body={body[:200]}")
+
+        # 403 is usually a permission / policy issue, not a stale-token issue.
+        if r.status == 403:
+            raise RuntimeError(f"HTTP 403 forbidden. body={body[:200]}")
+
+        raise RuntimeError(f"HTTP {r.status} error. body={body[:200]}")
+
 
 def spotify_get_token(client_id: str, client_secret: str) -> Tuple[str, int]:
     """
@@ -158,44 +311,110 @@ def spotify_get_token(client_id: str, client_secret: str) -> Tuple[str, int]:
     return str(token), expires
 
 
-def spotify_get_track(token: str, track_id: str) -> Dict[str, Any]:
+class SpotifyToken:
+    """
+    Client-credentials token shared by all worker threads.
+
+    Refreshes itself shortly before expiry and, via invalidate(), after a 401.
+    """
+
+    def __init__(self, client_id: str, client_secret: str, quiet: bool = False):
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._quiet = quiet
+        self._lock = threading.Lock()
+        self._token = ""
+        self._expires_at = 0.0
+        self._refresh()
+
+    def _refresh(self) -> None:
+        token, expires = spotify_get_token(self._client_id, self._client_secret)
+        self._token = token
+        # Refresh slightly before actual expiry so we do not hit expiry
+        # mid-request during longer batch runs.
+        self._expires_at = time.time() + max(0, int(expires) - 60)
+
+    def value(self) -> str:
+        """Return a valid access token, refreshing it if it is about to expire."""
+        with self._lock:
+            if time.time() >= self._expires_at:
+                if not self._quiet:
+                    eprint("[auth] token expired/near expiry, refreshing ...")
+                self._refresh()
+            return self._token
+
+    def invalidate(self, stale: str) -> None:
+        """Refresh after `stale` got a 401, unless another worker already did."""
+        with self._lock:
+            if self._token == stale:
+                self._refresh()
+
+
+def spotify_get_track(token: SpotifyToken, track_id: str) -> Dict[str, Any]:
     """Fetch Spotify track metadata."""
     req = Request(
         f"https://api.spotify.com/v1/tracks/{track_id}",
         method="GET",
-        headers={"Authorization": f"Bearer {token}"},
     )
-    return http_json(req)
+    return http_json(req, token=token)
 
 
-def spotify_get_album(token: str, album_id: str) -> Dict[str, Any]:
+def spotify_get_album(token: SpotifyToken, album_id: str) -> Dict[str, Any]:
     """Fetch Spotify album metadata."""
     req = Request(
         f"https://api.spotify.com/v1/albums/{album_id}",
         method="GET",
-        headers={"Authorization": f"Bearer {token}"},
     )
-    return http_json(req)
+    return http_json(req, token=token)
 
 
-def spotify_get_artist(token: str, artist_id: str) -> Dict[str, Any]:
+def spotify_get_artist(token: SpotifyToken, artist_id: str) -> Dict[str, Any]:
     """Fetch Spotify artist metadata."""
     req = Request(
         f"https://api.spotify.com/v1/artists/{artist_id}",
         method="GET",
-        headers={"Authorization": f"Bearer {token}"},
     )
-    return http_json(req)
+    return http_json(req, token=token)
 
 
-def spotify_get_audio_features(token: str, track_id: str) -> Dict[str, Any]:
+def spotify_get_audio_features(token: SpotifyToken, track_id: str) -> Dict[str, Any]:
     """Fetch Spotify audio features for a track."""
     req = Request(
         f"https://api.spotify.com/v1/audio-features/{track_id}",
         method="GET",
-        headers={"Authorization": f"Bearer {token}"},
     )
-    return http_json(req)
+    return http_json(req, token=token)
+
+
+# Maximum ids per request for Spotify's "get several" endpoints.
+SPOTIFY_BATCH_LIMITS = {
+    "tracks": 50,
+    "albums": 20,
+    "artists": 50,
+    "audio-features": 100,
+}
+
+
+def spotify_get_several(token: SpotifyToken, kind: str, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch several objects of one kind via /v1/<kind>?ids=...
+
+    Returns a dict keyed by object id. Ids Spotify does not know (null entries
+    in the response) are left out.
+    """
+    limit = SPOTIFY_BATCH_LIMITS[kind]
+    field = kind.replace("-", "_")
+    out: Dict[str, Dict[str, Any]] = {}
+
+    for i in range(0, len(ids), limit):
+        req = Request(
+            f"https://api.spotify.com/v1/{kind}?ids={','.join(ids[i:i + limit])}",
+            method="GET",
+        )
+        for obj in http_json(req, token=token).get(field) or []:
+            if obj and obj.get("id"):
+                out[str(obj["id"])] = obj
+    return out
 
 
 # ---------------------------------------------------------------------------
@@ -207,23 +426,21 @@ def spotify_get_audio_features(token: str, track_id: str) -> Dict[str, Any]:
 # working even if older files used slightly different names.
 # ---------------------------------------------------------------------------
 
-def read_spotify_url(path: str) -> Optional[str]:
-    """Read a Spotify URL tag from a local audio file, if present."""
-    audio = MFile(path, easy=True)
+def read_spotify_url(audio: Any) -> Optional[str]:
+    """Read a Spotify URL tag from an opened mutagen file, if present."""
     if not audio or not audio.tags:
         return None
 
-    keys = ["SPOTIFY_URL", "spotify_url", "Spotify_URL", "SPOTIFYURL", "spotifyurl", "TXXX:SPOTIFY_URL"]
-    for k in keys:
-        if k in audio.tags and audio.tags[k]:
-            v = str(audio.tags[k][0]).strip()
-            return v or None
-
-    for k in list(audio.tags.keys()):
-        if str(k).lower() in ("spotify_url", "spotifyurl"):
-            v = audio.tags.get(k)
-            if v:
-                return str(v[0]).strip() or None
+    # Map lower-cased tag names to the stored keys once, then look up the
+    # known variants directly instead of probing each spelling.
+    keys = {str(k).lower(): k for k in audio.tags.keys()}
+    for name in ("spotify_url", "spotifyurl", "txxx:spotify_url"):
+        k = keys.get(name)
+        if k is None:
+            continue
+        v = audio.tags.get(k)
+        if v:
+            return str(v[0]).strip() or None
 
     return None
 
@@ -241,10 +458,19 @@ def normalize_spotify_url(u: str) -> Optional[str]:
         return None
     u = u.strip()
 
+    # Fast path for the common canonical form, optionally followed by
+    # a query string (?si=...), fragment or trailing slash.
+    if u.startswith(SPOTIFY_TRACK_URL_PREFIX):
+        n = len(SPOTIFY_TRACK_URL_PREFIX)
+        tid = u[n:n + 22]
+        rest = u[n + 22:]
+        if (not rest or rest[0] in "/?#") and SPOTIFY_ID_RE.match(tid):
+            return SPOTIFY_TRACK_URL_PREFIX + tid
+
     if u.startswith("spotify:track:"):
         tid = u.split(":")[-1].strip()
         if SPOTIFY_ID_RE.match(tid):
-            return f"https://open.spotify.com/track/{tid}"
+            return SPOTIFY_TRACK_URL_PREFIX + tid
         return None
 
     try:
@@ -265,7 +491,7 @@ def normalize_spotify_url(u: str) -> Optional[str]:
             break
 
     if tid and SPOTIFY_ID_RE.match(tid):
-        return f"https://open.spotify.com/track/{tid}"
+        return SPOTIFY_TRACK_URL_PREFIX + tid
     return None
 
 
@@ -274,8 +500,8 @@ def spotify_track_id_from_url(u: str) -> Optional[str]:
     nu = normalize_spotify_url(u)
     if not nu:
         return None
-    tid = nu.rstrip("/").split("/")[-1]
-    return tid if tid and SPOTIFY_ID_RE.match(tid) else None
+    # normalize_spotify_url() only returns canonical URLs with a validated id.
+    return nu[len(SPOTIFY_TRACK_URL_PREFIX):]
 
 
 # ---------------------------------------------------------------------------
@@ -384,6 +610,23 @@ def spotify_key_to_initialkey(key: Any, mode: Any) -> str:
     return out
 
 
+# Spotify audio_features fields and the freeform tags they are written to.
+SPOTIFY_AF_TAGS: Tuple[Tuple[str, str], ...] = (
+    ("danceability", "SPOTIFY_AF_DANCEABILITY"),
+    ("energy", "SPOTIFY_AF_ENERGY"),
+    ("key", "SPOTIFY_AF_KEY"),
+    ("loudness", "SPOTIFY_AF_LOUDNESS"),
+    ("mode", "SPOTIFY_AF_MODE"),
+    ("speechiness", "SPOTIFY_AF_SPEECHINESS"),
+    ("acousticness", "SPOTIFY_AF_ACOUSTICNESS"),
+    ("instrumentalness", "SPOTIFY_AF_INSTRUMENTALNESS"),
+    ("liveness", "SPOTIFY_AF_LIVENESS"),
+    ("valence", "SPOTIFY_AF_VALENCE"),
+    ("tempo", "SPOTIFY_AF_TEMPO"),
+    ("time_signature", "SPOTIFY_AF_TIME_SIGNATURE"),
+)
+
+
 def is_already_enriched(audio: Any, mp3_mode: bool) -> bool:
     """
     Return True if the file already looks fully enriched.
@@ -406,24 +649,76 @@ def is_already_enriched(audio: Any, mp3_mode: bool) -> bool:
     ]
     return all(get_tag_value(audio, key, mp3_mode) for key in required_keys)
 
+# ---------------------------------------------------------------------------
+# Background tag saving
+# ---------------------------------------------------------------------------
+#
+# audio.save() rewrites the tag block on disk and can stall on slow storage.
+# With --write, saves are queued to one background thread so workers can
+# move on to the next file's Spotify requests while the previous file is
+# being written. The queue is bounded to keep memory flat on large batches.
+# ---------------------------------------------------------------------------
+
+class TagSaver:
+    """Run queued audio.save() calls one after another on a background thread."""
+
+    def __init__(self, quiet: bool, maxsize: int = 16):
+        self.quiet = quiet
+        self.failed = 0
+        self._queue: "queue.Queue[Optional[Tuple[str, Any, int]]]" = queue.Queue(maxsize)
+        self._thread = threading.Thread(target=self._run, name="tag-saver", daemon=True)
+        self._thread.start()
+
+    def put(self, path: str, audio: Any, changed: int) -> None:
+        self._queue.put((path, audio, changed))
+
+    def close(self) -> None:
+        """Wait until all queued saves are done."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            path, audio, changed = item
+            try:
+                audio.save()
+            except Exception as ex:
+                self.failed += 1
+                with OUTPUT_LOCK:
+                    eprint(f"[err] ERROR writing tags: {ex} ({path})")
+                continue
+
+            if not self.quiet:
+                with OUTPUT_LOCK:
+                    print(f"Wrote {changed} tag(s): {path}")
+
+
 # ---------------------------------------------------------------------------
 # Per-file enrichment
 # ---------------------------------------------------------------------------
 #
 # Flow:
-# 1) read SPOTIFY_URL from local file tags
+# 1) take the tags parsed by the batch pre-scan (or open the file once) and
+#    read SPOTIFY_URL from them
 # 2) normalize URL and extract track ID
 # 3) fetch Spotify track / album / artist / audio-features metadata
 # 4) optionally dump metadata to stdout
 # 5) optionally write enriched tags back to the file
 #
 # Caches are passed in from main() so large batch runs do not repeatedly fetch
-# the same album / artist / audio-features data.
+# the same track / album / artist / audio-features data. main() fills them up
+# front via prefetch_spotify_data(); anything missing there is still fetched
+# per file here. They are shared between worker threads; two workers missing
+# the same key at once just fetch it twice.
 # ---------------------------------------------------------------------------
 
 def enrich_one(
     path: str,
-    token: str,
+    token: SpotifyToken,
     force: bool,
     write: bool,
     set_year: bool,
@@ -432,11 +727,28 @@ def enrich_one(
     dj: bool,
     dump: bool,
     quiet: bool,
+    track_cache: Dict[str, Dict[str, Any]],
     album_cache: Dict[str, Dict[str, Any]],
     artist_cache: Dict[str, Dict[str, Any]],
     af_cache: Dict[str, Dict[str, Any]],
+    saver: Optional[TagSaver] = None,
+    audio: Any = None,
+    mp3_mode: Optional[bool] = None,
+    enriched: bool = False,
 ) -> bool:
-    su_raw = read_spotify_url(path)
+    # The batch pre-scan already found this file complete; do not reopen it.
+    if enriched:
+        if not quiet:
+            print(f"[skip] Already fully enriched: {path}")
+        return True
+
+    # Open local tags once: the same object (normally the one the pre-scan
+    # parsed) is used to read SPOTIFY_URL, to skip already-enriched files
+    # before any Spotify API request, and to write.
+    if audio is None:
+        audio = MFile(path, easy=True)
+
+    su_raw = read_spotify_url(audio)
     if not su_raw:
         if not quiet:
             eprint(f"[skip] No SPOTIFY_URL tag found in: {path}")
@@ -452,21 +764,15 @@ def enrich_one(
         eprint(f"[skip] Could not extract Spotify track id from URL: {su} ({path})")
         return False
 
-    # Open local tags early so we can skip already-enriched files before making
-    # any Spotify API requests.
-    audio = MFile(path, easy=True)
-    if not audio:
-        eprint(f"[err] mutagen could not open file for tagging: {path}")
-        return False
-
-    mp3_mode = is_mp3(path, audio)
+    if mp3_mode is None:
+        mp3_mode = is_mp3(path, audio)
 
     if not force and is_already_enriched(audio, mp3_mode):
         if not quiet:
             print(f"[skip] Already fully enriched: {path}")
         return True
 
-    track = spotify_get_track(token, tid)
+    track = track_cache.get(tid) or spotify_get_track(token, tid)
 
     title = str(track.get("name") or "").strip()
     dur_ms = int(track.get("duration_ms") or 0)
@@ -573,45 +879,35 @@ def enrich_one(
             else:
                 print(f"  Release: {release_date}")
 
-    tags_to_write: Dict[str, str] = {
-        "SPOTIFY_URL": su,
-        "SPOTIFY_TRACK_ID": tid,
-        "SPOTIFY_TITLE": title,
-        "SPOTIFY_ARTIST": artist0,
-        "SPOTIFY_ALBUM": album_name,
-        "SPOTIFY_ALBUM_ID": album_id,
-        "SPOTIFY_ISRC": isrc,
-        "SPOTIFY_UPC": upc,
-        "SPOTIFY_DURATION_MS": str(dur_ms),
-        "SPOTIFY_EXPLICIT": "1" if explicit else "0",
-        "SPOTIFY_POPULARITY": str(popularity),
-        "SPOTIFY_DISC_NUMBER": str(disc_no),
-        "SPOTIFY_TRACK_NUMBER": str(track_no),
-        "SPOTIFY_RELEASE_DATE": release_date,
-        "SPOTIFY_RELEASE_DATE_PRECISION": release_prec,
-        "SPOTIFY_ALBUM_TYPE": album_type,
-        "SPOTIFY_LABEL": label,
-        "SPOTIFY_ALBUM_TOTAL_TRACKS": str(total_tracks),
-        "SPOTIFY_ARTIST_GENRES": "; ".join(artist_genres),
-    }
-
-    af_map = {
-        "danceability": "SPOTIFY_AF_DANCEABILITY",
-        "energy": "SPOTIFY_AF_ENERGY",
-        "key": "SPOTIFY_AF_KEY",
-        "loudness": "SPOTIFY_AF_LOUDNESS",
-        "mode": "SPOTIFY_AF_MODE",
-        "speechiness": "SPOTIFY_AF_SPEECHINESS",
-        "acousticness": "SPOTIFY_AF_ACOUSTICNESS",
-        "instrumentalness": "SPOTIFY_AF_INSTRUMENTALNESS",
-        "liveness": "SPOTIFY_AF_LIVENESS",
-        "valence": "SPOTIFY_AF_VALENCE",
-        "tempo": "SPOTIFY_AF_TEMPO",
-        "time_signature": "SPOTIFY_AF_TIME_SIGNATURE",
-    }
-    for k, outk in af_map.items():
-        if k in audio_features and audio_features[k] is not None:
-            tags_to_write[outk] = str(audio_features[k])
+    # Freeform tags to write, built in one pass; empty values are skipped.
+    tag_pairs: List[Tuple[str, str]] = [
+        (k, v) for k, v in (
+            ("SPOTIFY_URL", su),
+            ("SPOTIFY_TRACK_ID", tid),
+            ("SPOTIFY_TITLE", title),
+            ("SPOTIFY_ARTIST", artist0),
+            ("SPOTIFY_ALBUM", album_name),
+            ("SPOTIFY_ALBUM_ID", album_id),
+            ("SPOTIFY_ISRC", isrc),
+            ("SPOTIFY_UPC", upc),
+            ("SPOTIFY_DURATION_MS", str(dur_ms)),
+            ("SPOTIFY_EXPLICIT", "1" if explicit else "0"),
+            ("SPOTIFY_POPULARITY", str(popularity)),
+            ("SPOTIFY_DISC_NUMBER", str(disc_no)),
+            ("SPOTIFY_TRACK_NUMBER", str(track_no)),
+            ("SPOTIFY_RELEASE_DATE", release_date),
+            ("SPOTIFY_RELEASE_DATE_PRECISION", release_prec),
+            ("SPOTIFY_ALBUM_TYPE", album_type),
+            ("SPOTIFY_LABEL", label),
+            ("SPOTIFY_ALBUM_TOTAL_TRACKS", str(total_tracks)),
+            ("SPOTIFY_ARTIST_GENRES", "; ".join(artist_genres)),
+        ) if v
+    ]
+    tag_pairs += [
+        (outk, str(audio_features[k]))
+        for k, outk in SPOTIFY_AF_TAGS
+        if audio_features.get(k) is not None
+    ]
 
     std_writes: List[Tuple[str, str]] = []
 
@@ -652,12 +948,16 @@ def enrich_one(
         return True
 
     changed = 0
-    for k, v in tags_to_write.items():
-        if not v:
-            continue
-        ch, _used_key = set_tag_easy(audio, k, v, force=force, mp3_mode=mp3_mode)
-        if ch:
-            changed += 1
+    if force and not mp3_mode and audio.tags is not None:
+        # Vorbis-style tags take any key and --force overwrites everything,
+        # so apply all freeform tags in one update.
+        audio.tags.update({k: [v] for k, v in tag_pairs})
+        changed += len(tag_pairs)
+    else:
+        for k, v in tag_pairs:
+            ch, _used_key = set_tag_easy(audio, k, v, force=force, mp3_mode=mp3_mode)
+            if ch:
+                changed += 1
 
     for f, v in std_writes:
         if set_standard_field(audio, f, v, force=force):
@@ -668,6 +968,10 @@ def enrich_one(
             print("No changes (everything already present, or --force not set).")
         return True
 
+    if saver is not None:
+        saver.put(path, audio, changed)
+        return True
+
     try:
         audio.save()
     except Exception as ex:
@@ -679,13 +983,118 @@ def enrich_one(
     return True
 
 
+# ---------------------------------------------------------------------------
+# Batch prefetch
+# ---------------------------------------------------------------------------
+#
+# Before enriching, scan the files (on the worker pool when --jobs > 1),
+# collect the track ids of the files that still need work and fetch tracks,
+# albums, artists and (if needed) audio features through the "get several"
+# endpoints. That turns ~3-4 requests per file into a handful of requests per
+# 20-100 files. Failures here are not fatal: enrich_one() falls back to
+# single-object requests for anything not in the caches.
+#
+# The scan result of each file goes to enrich_one(), so a file's tags are
+# parsed only once: already-enriched files are skipped without reopening and
+# the rest reuse the parsed object. main() works through PREFETCH_CHUNK files
+# at a time, so only that many parsed files are held in memory at once.
+# ---------------------------------------------------------------------------
+
+PREFETCH_CHUNK = 200
+
+
+def _prescan_file(path: str, force: bool) -> Tuple[Any, Optional[str], Optional[bool], bool]:
+    """
+    Return (audio, track id, mp3_mode, already enriched) for one file.
+
+    audio is None for already-enriched files (nothing left to do with it) and
+    for files that could not be opened; enrich_one() then reports the error.
+    """
+    try:
+        audio = MFile(path, easy=True)
+    except Exception:
+        return None, None, None, False
+    if not audio:
+        return None, None, None, False
+
+    mp3_mode = is_mp3(path, audio)
+    tid = spotify_track_id_from_url(read_spotify_url(audio) or "")
+    if tid and not force and is_already_enriched(audio, mp3_mode):
+        return None, tid, mp3_mode, True
+    return audio, tid, mp3_mode, False
+
+
+def prefetch_spotify_data(
+    paths: List[str],
+    token: SpotifyToken,
+    force: bool,
+    need_audio_features: bool,
+    quiet: bool,
+    track_cache: Dict[str, Dict[str, Any]],
+    album_cache: Dict[str, Dict[str, Any]],
+    artist_cache: Dict[str, Dict[str, Any]],
+    af_cache: Dict[str, Dict[str, Any]],
+    map_fn: Callable = map,
+) -> List[Tuple[Any, Optional[str], Optional[bool], bool]]:
+    """Fill the caches for the files that need work; return the scan result per path."""
+    scans = list(map_fn(partial(_prescan_file, force=force), paths))
+
+    # Dicts keep first-seen order and dedupe in O(1).
+    tids: Dict[str, None] = {}
+    for _audio, tid, _mp3_mode, done in scans:
+        if tid and not done and tid not in track_cache:
+            tids.setdefault(tid)
+
+    if not tids:
+        return scans
+
+    try:
+        tracks = spotify_get_several(token, "tracks", list(tids))
+        track_cache.update(tracks)
+
+        album_ids: Dict[str, None] = {}
+        artist_ids: Dict[str, None] = {}
+        for track in tracks.values():
+            album_id = str((track.get("album") or {}).get("id") or "").strip()
+            if album_id and album_id not in album_cache:
+                album_ids.setdefault(album_id)
+
+            artists = track.get("artists") or []
+            artist_id = str((artists[0] or {}).get("id") or "").strip() if artists else ""
+            if artist_id and artist_id not in artist_cache:
+                artist_ids.setdefault(artist_id)
+
+        album_cache.update(spotify_get_several(token, "albums", list(album_ids)))
+        artist_cache.update(spotify_get_several(token, "artists", list(artist_ids)))
+    except Exception as ex:
+        eprint(f"[warn] batch prefetch failed, falling back to per-file requests: {ex}")
+        return scans
+
+    if need_audio_features:
+        try:
+            af_cache.update(spotify_get_several(token, "audio-features", list(tids)))
+        except Exception as ex:
+            # Audio features are often denied (HTTP 403) for the whole app;
+            # do not repeat the same failing request for every file.
+            if not quiet:
+                eprint(f"[warn] could not fetch Spotify audio features: {ex}")
+            for tid in tids:
+                af_cache.setdefault(tid, {})
+
+    return scans
+
+
 # ---------------------------------------------------------------------------
 # CLI entry point
 # ---------------------------------------------------------------------------
 #
-# One Spotify token is fetched and reused for the whole batch run.
-# We refresh slightly before expiry to avoid edge cases during long runs.
-# If a single file still triggers a 401, we refresh once and retry that file.
+# One SpotifyToken is shared by all worker threads. It refreshes itself
+# slightly before expiry, and http_json() refreshes it once and retries the
+# request if Spotify still answers 401, so long runs do not abort mid-batch.
+#
+# Files are processed by --jobs worker threads so the Spotify round-trips of
+# different files overlap. 429 responses are still handled per request in
+# http_json(), so a higher job count mostly trades wall time for backoffs.
 # ---------------------------------------------------------------------------
 
 def main():
@@ -704,7 +1113,8 @@ def main():
     ap.add_argument("--dj", action="store_true", help="Also write DJ-friendly standard tags (bpm, initialkey)")
     ap.add_argument("--quiet", action="store_true", help="Less output (good for big batches)")
     ap.add_argument("--max-retries", type=int, default=6, help="Maximum retries for rate-limit/network errors")
-    ap.add_argument("--sleep", type=float, default=0.15, help="Small pacing sleep between requests (seconds)")
+    ap.add_argument("--sleep", type=float, default=0.15, help="Minimum gap between request starts across all jobs (seconds)")
+    ap.add_argument("--jobs", type=int, default=4, help="Number of files processed in parallel")
     args = ap.parse_args()
 
     HTTP_MAX_RETRIES = args.max_retries
@@ -716,79 +1126,80 @@ def main():
         eprint("Missing Spotify credentials. Set SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET (env) or pass flags.")
         sys.exit(3)
 
-    token, expires = spotify_get_token(cid, csec)
-
-    # Refresh slightly before actual expiry so we do not hit expiry mid-request
-    # during longer batch runs.
-    token_expires_at = time.time() + max(0, int(expires) - 60)
+    token = SpotifyToken(cid, csec, quiet=args.quiet)
 
+    track_cache: Dict[str, Dict[str, Any]] = {}
     album_cache: Dict[str, Dict[str, Any]] = {}
     artist_cache: Dict[str, Dict[str, Any]] = {}
     af_cache: Dict[str, Dict[str, Any]] = {}
 
-    ok = 0
-    fail = 0
-
-    for p in args.files:
-        if time.time() >= token_expires_at:
-            if not args.quiet:
-                eprint("[auth] token expired/near expiry, refreshing ...")
-            token, expires = spotify_get_token(cid, csec)
-            token_expires_at = time.time() + max(0, int(expires) - 60)
+    saver = TagSaver(args.quiet) if args.write else None
+
+    enrich = partial(
+        enrich_one,
+        token=token,
+        force=args.force,
+        write=args.write,
+        set_year=args.set_year,
+        set_date=args.set_date,
+        set_genre=args.set_genre,
+        dj=args.dj,
+        dump=args.dump,
+        quiet=args.quiet,
+        track_cache=track_cache,
+        album_cache=album_cache,
+        artist_cache=artist_cache,
+        af_cache=af_cache,
+        saver=saver,
+    )
 
+    def process(p: str, scan: Tuple[Any, Optional[str], Optional[bool], bool]) -> bool:
+        audio, _tid, mp3_mode, enriched = scan
         try:
-            if enrich_one(
-                p,
+            return enrich(p, audio=audio, mp3_mode=mp3_mode, enriched=enriched)
+        except Exception as ex:
+            eprint(f"[err] {ex} ({p})")
+            return False
+
+    jobs = max(1, min(args.jobs, len(args.files)))
+    pool = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    map_fn = pool.map if pool is not None else map
+    run = partial(run_buffered, process) if pool is not None else process
+
+    results: List[bool] = []
+    try:
+        if pool is not None:
+            sys.stdout = ThreadBufferedStream(sys.stdout)
+            sys.stderr = ThreadBufferedStream(sys.stderr)
+
+        for i in range(0, len(args.files), PREFETCH_CHUNK):
+            chunk = args.files[i:i + PREFETCH_CHUNK]
+            scans = prefetch_spotify_data(
+                chunk,
                 token=token,
                 force=args.force,
-                write=args.write,
-                set_year=args.set_year,
-                set_date=args.set_date,
-                set_genre=args.set_genre,
-                dj=args.dj,
-                dump=args.dump,
+                need_audio_features=args.dj or args.dump,
                 quiet=args.quiet,
+                track_cache=track_cache,
                 album_cache=album_cache,
                 artist_cache=artist_cache,
                 af_cache=af_cache,
-            ):
-                ok += 1
-            else:
-                fail += 1
-
-        except SpotifyAuthError as ex:
-            eprint(f"[auth] {ex} ({p})")
-            eprint("[auth] refreshing token and retrying once ...")
-            try:
-                token, expires = spotify_get_token(cid, csec)
-                token_expires_at = time.time() + max(0, int(expires) - 60)
-
-                if enrich_one(
-                    p,
-                    token=token,
-                    force=args.force,
-                    write=args.write,
-                    set_year=args.set_year,
-                    set_date=args.set_date,
-                    set_genre=args.set_genre,
-                    dj=args.dj,
-                    dump=args.dump,
-                    quiet=args.quiet,
-                    album_cache=album_cache,
-                    artist_cache=artist_cache,
-                    af_cache=af_cache,
-                ):
-                    ok += 1
-                else:
-                    fail += 1
-
-            except Exception as ex2:
-                eprint(f"[err] {ex2} ({p})")
-                fail += 1
-
-        except Exception as ex:
-            eprint(f"[err] {ex} ({p})")
-            fail += 1
+                map_fn=map_fn,
+            )
+            results += map_fn(run, chunk, scans)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if saver is not None:
+            saver.close()
+
+    ok = sum(1 for r in results if r)
+    fail = len(results) - ok
+
+    # Files whose queued save failed were counted as ok above.
+    if saver is not None:
+        ok -= saver.failed
+        fail += saver.failed
 
     if not args.quiet:
         print(f"\nDone: ok={ok} fail={fail}")
@@ -797,4 +1208,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
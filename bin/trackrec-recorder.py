@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 import argparse
+import collections
+import hashlib
+import math
+import mmap
 import os
 import re
-import signal
+import struct
 import subprocess
 import time
 
@@ -11,10 +15,44 @@ import dbus
 from gi.repository import GLib
 
 
+# players emit PropertiesChanged in bursts on track change; handle a burst once
+PROPERTIES_DEBOUNCE_MS = 100
+
+# raw PCM format between the capture ffmpeg and the per-track encoders
+CAPTURE_CHANNELS = 2
+CAPTURE_READ_SIZE = 1 << 16
+
+FFMPEG_PREFIX = ("ffmpeg", "-hide_banner", "-loglevel", "error")
+
+# (metadata key, tag, always written) for the encoder's -metadata flags
+ENCODER_TAGS = (
+    ("artist", "ARTIST", True),
+    ("title", "TITLE", True),
+    ("album", "ALBUM", False),
+    ("url", "SPOTIFY_URL", False),
+    ("tracknumber", "TRACKNUMBER", False),
+    ("discnumber", "DISCNUMBER", False),
+)
+
+# finished encoders are polled from the main loop instead of blocking on wait()
+ENCODER_POLL_MS = 50
+ENCODER_EXIT_TIMEOUT = 5
+
+# PCM queued for an encoder that is not keeping up (~47s at 44.1kHz stereo)
+ENCODER_BACKLOG_MAX = 1 << 23
+
+_SANITIZE_BAD_CHARS = '/\\:*?"<>|'
+_SANITIZE_BAD = re.compile(r"[\/\\\:\*\?\"\<\>\|]+")
+_SANITIZE_TABLE = str.maketrans(_SANITIZE_BAD_CHARS, "_" * len(_SANITIZE_BAD_CHARS))
+
+
 def sanitize(s: str) -> str:
     s = (s or "").strip()
-    s = re.sub(r"[\/\\\:\*\?\"\<\>\|]+", "_", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    t = s.translate(_SANITIZE_TABLE)
+    if t != s:
+        # keep collapsing runs of forbidden characters into a single "_"
+        t = _SANITIZE_BAD.sub("_", s)
+    s = " ".join(t.split())
     return s[:180] if s else "unknown"
 
 
@@ -40,6 +78,202 @@ def to_int_str(v) -> str:
         return ""
 
 
+def parse_metadata(md) -> dict:
+    artists = md.get("xesam:artist") or []
+    artist = str(artists[0]) if artists else ""
+
+    return {
+        "trackid": str(md.get("mpris:trackid", "")),
+        "artist": artist,
+        "title": str(md.get("xesam:title", "")),
+        "album": str(md.get("xesam:album", "")),
+        "url": str(md.get("xesam:url", "")),
+        "tracknumber": to_int_str(md.get("xesam:trackNumber")),
+        "discnumber": to_int_str(md.get("xesam:discNumber")),
+    }
+
+
+class UrlFilter:
+    """
+    Compact Bloom filter over kept SPOTIFY_URLs.
+
+    The plain-text .spotify_index stays the source of truth. The filter only
+    answers "definitely not seen" cheaply; positive hits are confirmed against
+    the index, so a false positive never skips a track.
+    """
+
+    MAGIC = b"TRBF1"
+    HEADER = struct.Struct("<QQQQQ")
+    MIN_CAPACITY = 4096
+
+    def __init__(self, capacity, error_rate=1e-4):
+        self.capacity = max(self.MIN_CAPACITY, int(capacity))
+        self.nbits = int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.nhashes = max(1, round(self.nbits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.nbits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, url):
+        h = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(h[:8], "little")
+        h2 = int.from_bytes(h[8:], "little") | 1
+        for i in range(self.nhashes):
+            yield (h1 + i * h2) % self.nbits
+
+    def add(self, url):
+        for p in self._positions(url):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def __contains__(self, url):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(url))
+
+    def is_full(self):
+        return self.count >= self.capacity
+
+    def save(self, path, covered):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(self.HEADER.pack(self.capacity, self.nbits, self.nhashes, self.count, covered))
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Return (filter, covered_index_bytes), or (None, 0) if missing/invalid."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None, 0
+
+        head = len(cls.MAGIC) + cls.HEADER.size
+        if len(data) < head or not data.startswith(cls.MAGIC):
+            return None, 0
+
+        capacity, nbits, nhashes, count, covered = cls.HEADER.unpack_from(data, len(cls.MAGIC))
+        if len(data) - head != (nbits + 7) // 8:
+            return None, 0
+
+        flt = cls.__new__(cls)
+        flt.capacity = capacity
+        flt.nbits = nbits
+        flt.nhashes = nhashes
+        flt.bits = bytearray(data[head:])
+        flt.count = count
+        return flt, covered
+
+
+class EncoderInput:
+    """
+    Non-blocking writer for a per-track encoder's stdin.
+
+    Capture data goes straight into the pipe while it has room; the rest is
+    queued and drained from an OUT watch, so an encoder that is slow to start
+    or stuck on a slow disk never stalls the main loop (and with it D-Bus
+    handling and the capture pipe). The queue is capped at ENCODER_BACKLOG_MAX
+    bytes; past that, new audio for this encoder is dropped.
+    """
+
+    def __init__(self, pipe):
+        self.pipe = pipe
+        self.fd = pipe.fileno()
+        os.set_blocking(self.fd, False)
+        self.backlog = collections.deque()
+        self.queued = 0
+        self.dropped = 0
+        self.watch = None
+        self.closing = False
+
+    def write(self, data):
+        if self.fd is None or self.closing:
+            return
+
+        if not self.backlog:
+            n = self._send(data)
+            if n is None or n == len(data):
+                return
+            data = data[n:]
+
+        if self.queued + len(data) > ENCODER_BACKLOG_MAX:
+            if not self.dropped:
+                print("Warning: encoder is not keeping up, dropping audio")
+            self.dropped += len(data)
+            return
+
+        self.backlog.append(data)
+        self.queued += len(data)
+        if self.watch is None:
+            self.watch = GLib.io_add_watch(
+                self.fd,
+                GLib.PRIORITY_HIGH,
+                GLib.IOCondition.OUT | GLib.IOCondition.HUP | GLib.IOCondition.ERR,
+                self._on_writable,
+            )
+
+    def close(self, wait=False):
+        """Close the encoder's input once the backlog is written."""
+        self.closing = True
+        if wait and self.backlog and self.fd is not None:
+            # no main loop to drain it (shutdown): write the rest blocking
+            self._remove_watch()
+            os.set_blocking(self.fd, True)
+            try:
+                for chunk in self.backlog:
+                    os.write(self.fd, chunk)
+            except OSError:
+                pass
+            self.backlog.clear()
+            self.queued = 0
+        if not self.backlog:
+            self._close_pipe()
+
+    def _send(self, data):
+        try:
+            return os.write(self.fd, data)
+        except BlockingIOError:
+            return 0
+        except OSError as e:
+            print(f"Warning: encoder stopped accepting audio: {e}")
+            self._remove_watch()
+            self.backlog.clear()
+            self.queued = 0
+            self._close_pipe()
+            return None
+
+    def _on_writable(self, fd, condition):
+        while self.backlog:
+            chunk = self.backlog[0]
+            n = self._send(chunk)
+            if n is None:
+                return False
+            self.queued -= n
+            if n < len(chunk):
+                self.backlog[0] = chunk[n:]
+                return True
+            self.backlog.popleft()
+
+        self.watch = None
+        if self.closing:
+            self._close_pipe()
+        return False
+
+    def _remove_watch(self):
+        if self.watch is not None:
+            GLib.source_remove(self.watch)
+            self.watch = None
+
+    def _close_pipe(self):
+        if self.fd is None:
+            return
+        self.fd = None
+        try:
+            self.pipe.close()
+        except OSError:
+            pass
+
+
 class Recorder:
     def __init__(
         self,
@@ -69,12 +303,31 @@ class Recorder:
         self.autoskip_pending = False
         self.autoskip_track_id = None
 
+        # everything but the tags and output path is fixed for the session
+        if self.out_format == "flac":
+            codec = ("-acodec", "flac", "-compression_level", str(self.comp_level))
+        elif self.out_format == "mp3":
+            codec = ("-acodec", "libmp3lame", "-b:a", self.mp3_bitrate)
+        else:
+            raise RuntimeError(f"Unsupported format: {self.out_format}")
+        self.encoder_args = (
+            *FFMPEG_PREFIX,
+            "-f", "s16le", "-ar", str(self.sample_rate), "-ac", str(CAPTURE_CHANNELS),
+            "-i", "pipe:0",
+            *codec,
+        )
+
         self.bus = dbus.SessionBus()
         self.player_name = None
         self.props = None
         self.player = None
 
+        self.capture = None
+        self.capture_watch = None
+
         self.proc = None
+        self.encoder_input = None
+        self.closing = []
         self.current_path = None
         self.current_started_at = None
         self.current_track_id = None
@@ -82,9 +335,20 @@ class Recorder:
 
         self.playback_status = None
         self.pending = {}
+        self.changes_pending = {}
+        self.flush_source = None
+
+        # file names already in out_dir, so unique_path() does not stat every candidate
+        try:
+            self.existing_names = set(os.listdir(self.out_dir))
+        except OSError:
+            self.existing_names = set()
 
         self.index_file = os.path.join(self.out_dir, ".spotify_index")
-        self.seen_urls = set()
+        self.filter_file = self.index_file + ".bf"
+        self.seen_filter = None
+        self.index_covered = 0
+        self.index_fd = None
         if self.dedupe:
             self._load_index()
 
@@ -122,23 +386,122 @@ class Recorder:
 
     def _load_index(self):
         try:
-            with open(self.index_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    u = line.strip()
-                    if u:
-                        self.seen_urls.add(u)
+            size = os.path.getsize(self.index_file)
+        except OSError:
+            size = 0
+
+        # reuse the persisted filter and only replay lines appended since it was saved
+        flt, covered = UrlFilter.load(self.filter_file)
+        if flt is None or covered > size:
+            self._rebuild_filter(size)
+            return
+
+        self.seen_filter = flt
+        self.index_covered = covered
+        if not self._replay_index(covered):
+            self._rebuild_filter(size)
+
+    def _rebuild_filter(self, size):
+        # ~54 bytes per index line; leave room to grow before the next rebuild
+        capacity = 2 * (size // 54)
+        while True:
+            self.seen_filter = UrlFilter(capacity)
+            self.index_covered = 0
+            if self._replay_index(0):
+                return
+            capacity = 2 * self.seen_filter.capacity
+
+    def _replay_index(self, offset):
+        """Add index lines from byte offset on; False if the filter ran full."""
+        try:
+            with open(self.index_file, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size <= offset:
+                    return True
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    pos = offset
+                    while pos < size:
+                        end = mm.find(b"\n", pos)
+                        end = size if end < 0 else end + 1
+                        u = mm[pos:end].decode("utf-8", "replace").strip()
+                        self.index_covered += end - pos
+                        pos = end
+                        if u:
+                            self.seen_filter.add(u)
+                            if self.seen_filter.is_full():
+                                return False
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _index_contains(self, url: str) -> bool:
+        # search the mapped file for a whole-line match instead of reading it line by line
+        needle = url.encode("utf-8")
+        try:
+            with open(self.index_file, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return False
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    pos = mm.find(needle)
+                    while pos >= 0:
+                        end = pos + len(needle)
+                        if (pos == 0 or mm[pos - 1] == 0x0A) and mm[end:end + 1] in (b"", b"\n", b"\r"):
+                            return True
+                        pos = mm.find(needle, pos + 1)
         except FileNotFoundError:
             pass
+        return False
+
+    def _is_seen(self, url: str) -> bool:
+        # recordings whose encoder is still closing are not in the index yet
+        if any(u == url and dur >= self.min_seconds for _, (_, dur, u) in self.closing):
+            return True
+        if url not in self.seen_filter:
+            return False
+        # Bloom filters may report false positives; confirm against the index
+        return self._index_contains(url)
+
+    def _save_filter(self):
+        if self.seen_filter is None:
+            return
+        try:
+            self.seen_filter.save(self.filter_file, self.index_covered)
+        except Exception as e:
+            print(f"Warning: could not write filter file '{self.filter_file}': {e}")
 
     def _append_index(self, url: str):
         if not url:
             return
-        self.seen_urls.add(url)
+        line = (url + "\n").encode("utf-8")
         try:
-            with open(self.index_file, "a", encoding="utf-8") as f:
-                f.write(url + "\n")
+            # one descriptor for the session; O_DSYNC makes each append a single
+            # write that is on stable storage when it returns
+            if self.index_fd is None:
+                self.index_fd = os.open(
+                    self.index_file,
+                    os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_DSYNC,
+                    0o644,
+                )
+            os.write(self.index_fd, line)
         except Exception as e:
             print(f"Warning: could not write index file '{self.index_file}': {e}")
+            return
+
+        self.index_covered += len(line)
+        self.seen_filter.add(url)
+        if self.seen_filter.is_full():
+            self._rebuild_filter(self.index_covered)
+
+    def _close_index(self):
+        if self.index_fd is None:
+            return
+        try:
+            os.close(self.index_fd)
+        except OSError:
+            pass
+        self.index_fd = None
 
     def connect_player(self):
         self.player_name = pick_mpris_player(self.bus, self.preferred_player)
@@ -164,34 +527,85 @@ class Recorder:
         return str(self.props.Get("org.mpris.MediaPlayer2.Player", "PlaybackStatus"))
 
     def get_metadata(self):
-        md = self.props.Get("org.mpris.MediaPlayer2.Player", "Metadata")
-
-        artists = md.get("xesam:artist") or []
-        artist = str(artists[0]) if artists else ""
-
-        return {
-            "trackid": str(md.get("mpris:trackid", "")),
-            "artist": artist,
-            "title": str(md.get("xesam:title", "")),
-            "album": str(md.get("xesam:album", "")),
-            "url": str(md.get("xesam:url", "")),
-            "tracknumber": to_int_str(md.get("xesam:trackNumber")),
-            "discnumber": to_int_str(md.get("xesam:discNumber")),
-        }
+        return parse_metadata(self.props.Get("org.mpris.MediaPlayer2.Player", "Metadata"))
 
     def unique_path(self, base):
         base = sanitize(base)
         ext = ".flac" if self.out_format == "flac" else ".mp3"
-        path = os.path.join(self.out_dir, f"{base}{ext}")
-        if not os.path.exists(path):
-            return path
+        name = f"{base}{ext}"
         i = 2
         while True:
-            p = os.path.join(self.out_dir, f"{base} ({i}){ext}")
-            if not os.path.exists(p):
-                return p
+            if name not in self.existing_names:
+                path = os.path.join(self.out_dir, name)
+                # single stat to catch files created behind our back
+                if not os.path.exists(path):
+                    return path
+                self.existing_names.add(name)
+            name = f"{base} ({i}){ext}"
             i += 1
 
+    def _open_capture(self):
+        # One long-lived ffmpeg reads the source and writes raw PCM to a pipe.
+        # Per-track encoders are fed from it, so a track change never reopens
+        # the source and no audio is lost while the next encoder starts up.
+        if self.capture and self.capture.poll() is None:
+            return
+
+        # Drop a dead capture's watch and pipe first, so a queued EOF on the
+        # old fd cannot tear down the capture started below.
+        self._close_capture()
+
+        cmd = [
+            *FFMPEG_PREFIX,
+            "-ar", str(self.sample_rate),
+            "-f", "pulse", "-i", self.source,
+            "-ac", str(CAPTURE_CHANNELS),
+            "-f", "s16le", "pipe:1",
+        ]
+        self.capture = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE)
+        self.capture_watch = GLib.io_add_watch(
+            self.capture.stdout.fileno(),
+            GLib.PRIORITY_HIGH,
+            GLib.IOCondition.IN | GLib.IOCondition.HUP | GLib.IOCondition.ERR,
+            self._on_capture_data,
+        )
+
+    def _on_capture_data(self, fd, condition):
+        try:
+            data = os.read(fd, CAPTURE_READ_SIZE)
+        except OSError:
+            data = b""
+
+        if not data:
+            print("Warning: capture ffmpeg stopped")
+            self.capture_watch = None
+            self._close_capture()
+            self._finalize()
+            return False
+
+        if self.encoder_input is not None:
+            self.encoder_input.write(data)
+        return True
+
+    def _close_capture(self):
+        if self.capture_watch is not None:
+            GLib.source_remove(self.capture_watch)
+            self.capture_watch = None
+
+        if not self.capture:
+            return
+
+        # the PCM stream is disposable; close our end first so ffmpeg cannot
+        # block on a full pipe while shutting down
+        try:
+            self.capture.stdout.close()
+            self.capture.terminate()
+            self.capture.wait(timeout=5)
+        except Exception:
+            self.capture.kill()
+        finally:
+            self.capture = None
+
     def _clear_autoskip(self):
         self.autoskip_pending = False
         self.autoskip_track_id = None
@@ -265,57 +679,90 @@ class Recorder:
         print(f"AUTOSKIP scheduled in {delay}s")
         GLib.timeout_add_seconds(delay, self._autoskip_next)
 
-    def _finalize(self):
+    def _finalize(self, wait=False):
         if not self.proc:
             return
 
+        proc = self.proc
+        encoder_input = self.encoder_input
+        dur = time.time() - self.current_started_at if self.current_started_at else 0.0
+        rec = (self.current_path, dur, self.current_url)
+
+        self.proc = None
+        self.encoder_input = None
+        self.current_path = None
+        self.current_started_at = None
+        self.current_track_id = None
+        self.current_url = None
+
+        # closing stdin ends the encoder's input; it finishes the file and exits
+        encoder_input.close(wait=wait)
+
+        self.closing.append((proc, rec))
+        if wait:
+            self._reap(proc, rec, timeout=ENCODER_EXIT_TIMEOUT)
+        else:
+            deadline = time.time() + ENCODER_EXIT_TIMEOUT
+            GLib.timeout_add(ENCODER_POLL_MS, self._poll_closing, proc, rec, deadline)
+
+    def _poll_closing(self, proc, rec, deadline):
+        if proc.poll() is None and time.time() < deadline:
+            return True
+        self._reap(proc, rec)
+        return False
+
+    def _reap(self, proc, rec, timeout=0):
         try:
-            self.proc.send_signal(signal.SIGINT)
-            self.proc.wait(timeout=5)
+            proc.wait(timeout=timeout)
         except Exception:
-            self.proc.kill()
-        finally:
-            self.proc = None
+            proc.kill()
+            proc.wait()
+        self.closing.remove((proc, rec))
+        self._finish(*rec)
 
+    def _finish(self, path, dur, url):
         kept = False
-        dur = 0.0
-        if self.current_path and self.current_started_at:
-            dur = time.time() - self.current_started_at
+        if path:
             if dur < self.min_seconds:
                 try:
-                    os.remove(self.current_path)
-                    print(f"DROP ({dur:.1f}s) -> {self.current_path}")
+                    os.remove(path)
+                    print(f"DROP ({dur:.1f}s) -> {path}")
                 except FileNotFoundError:
                     pass
+                self.existing_names.discard(os.path.basename(path))
             else:
-                print(f"KEEP ({dur:.1f}s) -> {self.current_path}")
+                print(f"KEEP ({dur:.1f}s) -> {path}")
                 kept = True
 
-        if kept and self.dedupe and self.current_url:
-            self._append_index(self.current_url)
+        if kept and self.dedupe and url:
+            self._append_index(url)
 
-        self._write_status(
-            STATE="idle",
+        # a duplicate skip started since then owns the status
+        if not self.proc and self.current_track_id:
+            return
+
+        fields = dict(
             LAST_RESULT=("KEEP" if kept else "DROP"),
             LAST_DURATION=f"{dur:.1f}",
-            LAST_FILE=self.current_path or "",
-            LAST_SPOTIFY_URL=self.current_url or "",
-            AUTOSKIP=("1" if self.autoskip else "0"),
-            AUTOSKIP_DELAY=str(self.autoskip_delay),
-            AUTOSKIP_PENDING="0",
+            LAST_FILE=path or "",
+            LAST_SPOTIFY_URL=url or "",
         )
-
-        self.current_path = None
-        self.current_started_at = None
-        self.current_track_id = None
-        self.current_url = None
+        # only go idle if the next track did not start recording meanwhile
+        if not self.proc:
+            fields.update(
+                STATE="idle",
+                AUTOSKIP=("1" if self.autoskip else "0"),
+                AUTOSKIP_DELAY=str(self.autoskip_delay),
+                AUTOSKIP_PENDING="0",
+            )
+        self._write_status(**fields)
 
     def _start(self, md):
         os.makedirs(self.out_dir, exist_ok=True)
 
         url = md.get("url") or ""
 
-        if self.dedupe and url and url in self.seen_urls:
+        if self.dedupe and url and self._is_seen(url):
             artist = md.get("artist", "").strip()
             title = md.get("title", "").strip()
             print(f"SKIP duplicate (SPOTIFY_URL seen): {artist} - {title}")
@@ -340,45 +787,19 @@ class Recorder:
 
         name = f"{md['artist']} - {md['title']}".strip(" -")
         out_path = self.unique_path(name)
+        self.existing_names.add(os.path.basename(out_path))
 
-        cmd = [
-            "ffmpeg",
-            "-hide_banner", "-loglevel", "error",
-            "-ar", str(self.sample_rate),
-            "-f", "pulse", "-i", self.source,
-        ]
-
-        if self.out_format == "flac":
-            cmd += [
-                "-acodec", "flac",
-                "-compression_level", str(self.comp_level),
-            ]
-        elif self.out_format == "mp3":
-            cmd += [
-                "-acodec", "libmp3lame",
-                "-b:a", self.mp3_bitrate,
-            ]
-        else:
-            raise RuntimeError(f"Unsupported format: {self.out_format}")
-
-        cmd += [
-            "-metadata", f"ARTIST={md['artist']}",
-            "-metadata", f"TITLE={md['title']}",
-        ]
-
-        if md["album"]:
-            cmd += ["-metadata", f"ALBUM={md['album']}"]
-        if md["url"]:
-            cmd += ["-metadata", f"SPOTIFY_URL={md['url']}"]
-        if md["tracknumber"]:
-            cmd += ["-metadata", f"TRACKNUMBER={md['tracknumber']}"]
-        if md["discnumber"]:
-            cmd += ["-metadata", f"DISCNUMBER={md['discnumber']}"]
+        self._open_capture()
 
+        cmd = list(self.encoder_args)
+        for key, tag, always in ENCODER_TAGS:
+            if always or md[key]:
+                cmd += ("-metadata", f"{tag}={md[key]}")
         cmd.append(out_path)
 
         print(f"REC -> {out_path}")
-        self.proc = subprocess.Popen(cmd)
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        self.encoder_input = EncoderInput(self.proc.stdin)
         self.current_path = out_path
         self.current_started_at = time.time()
         self.current_track_id = md["trackid"]
@@ -412,40 +833,70 @@ class Recorder:
         if interface != "org.mpris.MediaPlayer2.Player":
             return
 
-        if "PlaybackStatus" in changed:
-            self.playback_status = str(changed["PlaybackStatus"])
-            if self.playback_status in ("Paused", "Stopped"):
-                self._finalize()
-            elif self.playback_status == "Playing":
-                self._ensure_started()
+        for key in ("PlaybackStatus", "Metadata"):
+            if key in changed:
+                self.changes_pending[key] = changed[key]
+
+        if self.changes_pending and self.flush_source is None:
+            self.flush_source = GLib.timeout_add(PROPERTIES_DEBOUNCE_MS, self._flush_changes)
 
+    def _flush_changes(self):
+        self.flush_source = None
+        changed, self.changes_pending = self.changes_pending, {}
+
+        # apply new metadata first, so a status change in the same burst
+        # starts recording under the new track's name
+        md = None
         if "Metadata" in changed:
-            md = self.get_metadata()
+            # the signal carries the full Metadata map; only ask the player
+            # again if it sent a partial one (the url is needed for the
+            # SPOTIFY_URL tag and the seen-check)
+            md = parse_metadata(changed["Metadata"])
+            if not md["trackid"] or not md["title"] or not md["url"]:
+                md = self.get_metadata()
 
             if self.autoskip_pending and md.get("trackid") != self.autoskip_track_id:
                 self._clear_autoskip()
 
             self.pending = md
 
-            if self.playback_status != "Playing":
-                return
+        if "PlaybackStatus" in changed:
+            self.playback_status = str(changed["PlaybackStatus"])
+            if self.playback_status in ("Paused", "Stopped"):
+                self._finalize()
+            elif self.playback_status == "Playing":
+                self._ensure_started()
 
+        if md is not None and self.playback_status == "Playing":
             if not self.proc:
                 self._ensure_started()
             elif md["trackid"] and md["trackid"] != self.current_track_id:
                 self._finalize()
                 self._start(md)
 
+        return False
+
     def prime(self):
         os.makedirs(self.out_dir, exist_ok=True)
 
+        self._open_capture()
+
         self.playback_status = self.get_playback_status()
         self.pending = self.get_metadata()
         if self.playback_status == "Playing":
             self._ensure_started()
 
     def shutdown(self):
-        self._finalize()
+        if self.flush_source is not None:
+            GLib.source_remove(self.flush_source)
+            self.flush_source = None
+        self._finalize(wait=True)
+        for proc, rec in list(self.closing):
+            self._reap(proc, rec, timeout=ENCODER_EXIT_TIMEOUT)
+        self._close_capture()
+        if self.dedupe:
+            self._close_index()
+            self._save_filter()
 
 
 def main():